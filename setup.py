@@ -4,13 +4,24 @@
 To upload to PyPI:
 
     $ python setup.py sdist
-    $ python setup.py bdist_wheel --universal
+    $ python setup.py bdist_wheel
     $ twine upload dist/*
 
+The optional C extension makes wheels specific to the Python version
+and platform.  Build a wheel for each platform to upload, for example
+with cibuildwheel.  Other platforms install from the sdist, falling
+back to pure Python if they lack a compiler.
+
 """
 # Community Packages
-from setuptools import setup
+from setuptools import Extension, setup
 
 # Most arguments for ``setup`` should be written in ``setup.cfg``.
 # https://setuptools.readthedocs.io/en/latest/setuptools.html#using-a-src-layout
-setup()
+setup(
+    # The C extension is optional.  Without a compiler, the package
+    # falls back to pure Python (and NumPy) decoding.
+    ext_modules=[
+        Extension('xport._native', ['src/xport/_native.c'], optional=True),
+    ],
+)
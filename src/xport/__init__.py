@@ -10,6 +10,7 @@ import string
 import struct
 import textwrap
 import warnings
+from collections import namedtuple
 from collections.abc import Mapping, MutableMapping
 from datetime import datetime
 from io import StringIO
@@ -96,7 +97,7 @@ class Informat:
     #    char8 niform;      /* NAME OF INPUT FORMAT                   */
     #    short nifl;        /* INFORMAT LENGTH ATTRIBUTE              */
     #    short nifd;        /* INFORMAT NUMBER OF DECIMALS            */
-    byte_structure = '>8shh'
+    byte_structure = struct.Struct('>8shh')
 
     def __init__(self, name='', length=0, decimals=0):
         """
@@ -134,7 +135,7 @@ class Informat:
         name = self.name.encode('ascii').ljust(8)
         if len(name) > 8:
             raise ValueError('ASCII-encoded {name!r} longer than 8 bytes')
-        return struct.pack(fmt, name, self.length, self.decimals)
+        return fmt.pack(name, self.length, self.decimals)
 
     @classmethod
     def unpack(cls, bytestring):
@@ -142,7 +143,7 @@ class Informat:
         Create an informat from an XPORT-format bytestring.
         """
         fmt = cls.byte_structure
-        return cls.from_struct_tokens(*struct.unpack(fmt, bytestring))
+        return cls.from_struct_tokens(*fmt.unpack(bytestring))
 
     @classmethod
     def from_struct_tokens(cls, name, length, decimals):
@@ -212,7 +213,7 @@ class Format(Informat):
     #    short nfl;          /* FORMAT FIELD LENGTH OR 0               */
     #    short nfd;         /* FORMAT NUMBER OF DECIMALS              */
     #    short nfj;         /* 0=LEFT JUSTIFICATION, 1=RIGHT JUST     */
-    byte_structure = '>8shhh'
+    byte_structure = struct.Struct('>8shhh')
 
     def __init__(self, name='', length=0, decimals=0, justify=FormatAlignment.LEFT):
         """
@@ -245,7 +246,7 @@ class Format(Informat):
             raise ValueError('ASCII-encoded {name!r} longer than 8 bytes')
         length = self.length if self.length is not None else 0
         decimals = self.decimals if self.decimals is not None else 0
-        return struct.pack(fmt, name, length, decimals, self.justify)
+        return fmt.pack(name, length, decimals, self.justify)
 
     @classmethod
     def from_struct_tokens(cls, name, length, decimals, justify):
@@ -837,14 +838,21 @@ class Reader:
 
     def __init__(self, fp):
         self.dataset = to_dataframe(fp)
+        self._Observation = namedtuple('Observation', self.fields, rename=True)
 
     def __iter__(self):
-        return iter(self.dataset.itertuples(index=False, name='Observation'))
+        rows = self.dataset.itertuples(index=False, name=None)
+        return map(self._Observation._make, rows)
 
     @property
     def fields(self):
         return tuple(self.dataset.columns)
 
+    def _yield_dicts(self):
+        fields = self.fields
+        for values in self.dataset.itertuples(index=False, name=None):
+            yield dict(zip(fields, values))
+
     def __getattr__(self, name):
         return getattr(self.dataset, name)
 
@@ -860,5 +868,4 @@ class NamedTupleReader(Reader):
 class DictReader(Reader):
 
     def __iter__(self):
-        for row in super().__iter__():
-            yield row._asdict()
+        return self._yield_dicts()
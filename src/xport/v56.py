@@ -10,21 +10,40 @@ The SAS V5 Transport File format, also called XPORT, or simply XPT, ...
 # Floating point data are IBM-style double format.
 
 # Standard Library
+import codecs
 import contextlib
+import io
 import logging
 import math
+import mmap
+import os
 import re
+import stat
+import string
 import struct
 import warnings
 from collections.abc import Iterator, Mapping
 from datetime import datetime
 
 # Community Packages
+import numpy as np
 import pandas as pd
 
 # Xport Modules
 import xport
 
+try:
+    # Community Packages
+    import numba
+except ImportError:  # Optional, for faster decoding of numeric columns.
+    numba = None
+
+try:
+    # Xport Modules
+    from xport import _native
+except ImportError:  # Optional C extension, for faster decoding of rows.
+    _native = None
+
 __all__ = [
     'load',
     'loads',
@@ -100,8 +119,8 @@ class Namestr:
     # variable may be truncated.
 
     fmts = {
-        140: '>hhhh8s40s8shhh2s8shhl52s',
-        136: '>hhhh8s40s8shhh2s8shhl48s',
+        140: struct.Struct('>hhhh8s40s8shhh2s8shhl52s'),
+        136: struct.Struct('>hhhh8s40s8shhh2s8shhl48s'),
     }
 
     def __init__(self, vtype, length, number, name, label, format, informat, position):
@@ -173,13 +192,13 @@ class Namestr:
         """
         Construct a ``Namestr`` from an XPORT-format byte string.
         """
-        LOG.debug(f'Decode {type(cls).__name__}')
+        LOG.debug(f'Decode {cls.__name__}')
         # dtype='float' if vtype == xport.VariableType.NUMERIC else 'string'
         size = len(bytestring)
         if size == 136:
             warnings.warn('File written on VAX/VMS, module behavior not tested')
         fmt = cls.fmts[size]
-        tokens = struct.unpack(fmt, bytestring)
+        tokens = fmt.unpack(bytestring)
         return cls(
             vtype=xport.VariableType(tokens[0]),
             length=tokens[2],
@@ -207,8 +226,7 @@ class Namestr:
             raise ValueError('Variable number not assigned')
         if self.position is None:
             raise ValueError('Variable position not assigned')
-        return struct.pack(
-            fmt,
+        return fmt.pack(
             self.vtype,
             0,  # "Hash" of name, always 0.
             self.length,
@@ -401,7 +419,7 @@ class MemberHeader(Mapping):
         """
         Construct a ``MemberHeader`` from an XPORT-format byte string.
         """
-        LOG.debug(f'Decode {type(cls).__name__}')
+        LOG.debug(f'Decode {cls.__name__}')
         mo = cls.pattern.search(bytestring)  # TODO: Why ``search``, not ``match``?
         if mo is None:
             raise ValueError('No member header found')
@@ -501,42 +519,83 @@ class Observations(Iterator):
         """
         Yield observations from an XPORT-format byte string.
         """
-        LOG.debug(f'Decode {type(cls).__name__}')
-
-        def character_decode(s):
-            return s.decode(TEXT_DATA_ENCODING).rstrip()
-
-        converters = []
-        for namestr in header.values():
-            if namestr.vtype == xport.VariableType.NUMERIC:
-                converters.append(ibm_to_ieee)
-            else:
-                converters.append(character_decode)
+        LOG.debug(f'Decode {cls.__name__}')
 
         def iterator():
-            sizes = [namestr.length for namestr in header.values()]
-            fmt = ''.join(f'{x}s' for x in sizes)
-            stride = sum(sizes)
+            layout, stride = variable_layout(header)
             if stride == 0:
                 return
-            # TODO: The SAS Transport v5 specification says the sentinel
-            #       character is b' ', but people report b'\x00' is used
-            #       in some files.  Unfortunately, that would make rows
-            #       with all zeros indistiguishable from the sentinel.
-            sentinel = b' ' * stride
-            mview = memoryview(bytestring)
-            for i in range(0, len(mview), stride):
-                chunk = mview[i:i + stride]
-                if len(chunk) != stride or chunk == sentinel:
-                    return
-                # TODO: If only characters and the last row is all empty
-                #       or spaces, it's indistinguishable from padding.
-                #       https://github.com/selik/xport/issues/46
-                tokens = struct.unpack(fmt, chunk)
-                yield tuple(f(v) for f, v in zip(converters, tokens))
+            rows = observation_rows(bytestring, stride)
+            if _native is None or codecs.lookup(TEXT_DATA_ENCODING).name != 'iso8859-1':
+                columns = cls.columns_from_bytes(bytestring, header)
+                observations = zip(*(column.tolist() for column in columns.values()))
+            else:
+                observations = _native.decode_rows(bytestring, stride, len(rows), layout)
+            # Both decode special missing values as plain NaN.
+            special = special_missing_values(rows, layout)
+            if not special:
+                yield from observations
+                return
+            for i, observation in enumerate(observations):
+                if i in special:
+                    observation = list(observation)
+                    for j, value in special[i]:
+                        observation[j] = value
+                    observation = tuple(observation)
+                yield observation
 
         return cls(iterator(), header)
 
+    @classmethod
+    def columns_from_bytes(cls, bytestring, header):
+        """
+        Decode observations from an XPORT-format byte string as columns.
+
+        Returns a mapping of variable names to NumPy arrays.  Decoding
+        a whole column at a time is much faster than decoding a whole
+        observation at a time.
+        """
+        LOG.debug(f'Decode {cls.__name__} columns')
+        layout, stride = variable_layout(header)
+        if stride == 0:
+            return {name: np.array([], dtype=object) for name in header}
+        rows = observation_rows(bytestring, stride)
+        # TODO: If only characters and the last row is all empty
+        #       or spaces, it's indistinguishable from padding.
+        #       https://github.com/selik/xport/issues/46
+
+        # Character columns in Latin-1 can also be decoded a whole
+        # column at a time.  Others, or those with null bytes that
+        # NumPy would discard, are decoded one value at a time.
+        latin1 = codecs.lookup(TEXT_DATA_ENCODING).name == 'iso8859-1'
+        columns = {}
+        fmt = '>'
+        for name, (start, stop, numeric) in zip(header, layout):
+            # Slicing the rows is a strided view of a column, not a copy.
+            column = rows[:, start:stop]
+            if numeric:
+                columns[name] = ibm_to_ieee_array(column)
+            elif latin1 and not (column == 0).any():
+                columns[name] = latin1_decode_array(column)
+            else:
+                columns[name] = None
+                fmt += f'{stop - start}s'
+                continue
+            fmt += f'{stop - start}x'
+
+        if any(column is None for column in columns.values()):
+            # One precompiled struct unpacks the remaining character
+            # fields of a row, skipping over the others.
+            unpack_from = struct.Struct(fmt).unpack_from
+            tokens = [unpack_from(bytestring, i) for i in range(0, len(rows) * stride, stride)]
+            characters = zip(*tokens)
+            decode = codecs.getdecoder(TEXT_DATA_ENCODING)
+            for name, column in columns.items():
+                if column is None:
+                    strings = [decode(s)[0].rstrip() for s in next(characters, ())]
+                    columns[name] = np.array(strings, dtype=object)
+        return columns
+
     def to_bytes(self):
         """
         Get an iterator of XPORT-encoded observations.
@@ -555,7 +614,7 @@ class Observations(Iterator):
 
             return encoder
 
-        fmt = ''.join(f'{namestr.length}s' for namestr in self.header.values())
+        fmt = struct.Struct(''.join(f'{namestr.length}s' for namestr in self.header.values()))
         converters = []
         for namestr in self.header.values():
             if namestr.vtype == xport.VariableType.NUMERIC:
@@ -564,7 +623,7 @@ class Observations(Iterator):
                 converters.append(character_encoder(namestr.length))
         for t in self:
             g = (f(v) for f, v in zip(converters, t))
-            yield struct.pack(fmt, *g)
+            yield fmt.pack(*g)
 
     def __bytes__(self):
         """
@@ -608,7 +667,7 @@ class Member(xport.Dataset):
         """
         Decode the first ``Member`` from an XPORT-format byte string.
         """
-        LOG.debug(f'Decode {type(cls).__name__}')
+        LOG.debug(f'Decode {cls.__name__}')
         mview = memoryview(bytestring)
         matches = MemberHeader.pattern.finditer(mview)
 
@@ -626,12 +685,12 @@ class Member(xport.Dataset):
             j = mo.start(0)
 
         header = MemberHeader.from_bytes(mview[:i])
-        observations = Observations.from_bytes(mview[i:j], header)
+        columns = Observations.columns_from_bytes(mview[i:j], header)
 
         # This awkwardness works around Pandas subclasses misbehaving.
         # ``DataFrame.append`` discards subclass attributes.  Lame.
         head = cls.from_header(header)
-        data = Member(pd.DataFrame.from_records(observations, columns=list(header)))
+        data = Member(pd.DataFrame(columns, columns=list(header)))
         data.copy_metadata(head)
         LOG.info(f'Decoded XPORT dataset {data.name!r}')
         LOG.debug('%s', data)
@@ -804,6 +863,81 @@ def strftime(dt, minimum=datetime(1900, 1, 1), maximum=datetime(2100, 1, 1)):
     return dt.strftime('%d%b%y:%H:%M:%S').upper().encode('ascii')
 
 
+def variable_layout(header):
+    """
+    Get each variable's (start, stop) bytes in a row, and whether numeric.
+
+    Returns the list of (start, stop, numeric) triples and the row size.
+    """
+    layout = []
+    stride = 0
+    for namestr in header.values():
+        numeric = namestr.vtype == xport.VariableType.NUMERIC
+        layout.append((stride, stride + namestr.length, numeric))
+        stride += namestr.length
+    return layout, stride
+
+
+def observation_rows(bytestring, stride):
+    """
+    View XPORT-format observations as a 2-dimensional array of bytes.
+
+    Each row of the array is one observation, ``stride`` bytes wide.
+    The view ends before the trailing rows of blank padding, if any.
+    """
+    # TODO: The SAS Transport v5 specification says the sentinel
+    #       character is b' ', but people report b'\x00' is used
+    #       in some files.  Unfortunately, that would make rows
+    #       with all zeros indistiguishable from the sentinel.
+    n = len(bytestring) // stride
+    rows = np.frombuffer(bytestring, dtype=np.uint8, count=n * stride).reshape(n, stride)
+    # Padding only comes after the last observation, so search back
+    # from the end and stop at the first row with data.  That's usually
+    # a single batch, no matter how large the file.
+    batch = max(1, 2**20 // stride)
+    for i in range(n, 0, -batch):
+        data = (rows[max(0, i - batch):i] != ord(b' ')).any(axis=1)
+        if data.any():
+            return rows[:i - data[::-1].argmax()]
+    return rows[:0]
+
+
+def special_missing_values(rows, layout):
+    """
+    Find special missing values, like ``xport.NaN.A``, in observations.
+
+    Returns a mapping of row index to a list of (variable index, value)
+    pairs, for the special missing values in each row.
+    """
+    special = {}
+    for j, (start, stop, numeric) in enumerate(layout):
+        if not numeric:
+            continue
+        first = rows[:, start]
+        candidates = np.flatnonzero(np.isin(first, _SPECIAL_MISSING))
+        if not len(candidates):
+            continue
+        # A missing value has a zero mantissa.
+        candidates = candidates[~rows[candidates, start + 1:stop].any(axis=1)]
+        for i in candidates.tolist():
+            special.setdefault(i, []).append((j, getattr(xport.NaN, chr(rows[i, start]))))
+    return special
+
+
+# Right-shift to align an IBM-format mantissa's first 1-bit, indexed by
+# the mantissa's leading hex digit.  For example, 0x1 needs no shift,
+# but 0x8 through 0xf need 3.
+_SHIFTS = tuple(max(0, n.bit_length() - 1) for n in range(16))
+_SHIFTS_ARRAY = np.array(_SHIFTS, dtype=np.uint64)
+
+# First bytes of the special missing values, ``xport.NaN._`` through Z.
+_SPECIAL_MISSING = np.frombuffer(b'_' + string.ascii_uppercase.encode('ascii'), np.uint8)
+
+# Convert between floats and their bits as an unsigned long long.
+_PACK_Q, _UNPACK_Q = struct.Struct('>Q').pack, struct.Struct('>Q').unpack
+_PACK_D, _UNPACK_D = struct.Struct('>d').pack, struct.Struct('>d').unpack
+
+
 def ibm_to_ieee(ibm: bytes) -> float:
     """
     Convert IBM-format floating point (bytes) to IEEE 754 64-bit (float).
@@ -813,11 +947,13 @@ def ibm_to_ieee(ibm: bytes) -> float:
 
     # Pad-out to 8 bytes if necessary. We expect 2 to 8 bytes, but
     # there's no need to check; bizarre sizes will cause a struct
-    # module unpack error.
-    ibm = ibm.ljust(8, b'\x00')
+    # module unpack error.  Most values are already 8 bytes, so avoid
+    # the copy in that case.
+    if len(ibm) != 8:
+        ibm = ibm.ljust(8, b'\x00')
 
     # parse the 64 bits of IBM float as one 8-byte unsigned long long
-    ulong, = struct.unpack('>Q', ibm)
+    ulong, = _UNPACK_Q(ibm)
 
     # IBM: 1-bit sign, 7-bits exponent, 56-bits mantissa
     sign = ulong & 0x8000000000000000
@@ -840,15 +976,9 @@ def ibm_to_ieee(ibm: bytes) -> float:
     # leading zero-bits in the binary mantissa. IEEE format exponent
     # is base 2, so we don't need any leading zero-bits and will shift
     # accordingly. This is one of the criticisms of IBM-format, its
-    # wobbling precision.
-    if ulong & 0x0080000000000000:
-        shift = 3
-    elif ulong & 0x0040000000000000:
-        shift = 2
-    elif ulong & 0x0020000000000000:
-        shift = 1
-    else:
-        shift = 0
+    # wobbling precision.  The shift depends only on the mantissa's
+    # leading hex digit, so we look it up rather than test each bit.
+    shift = _SHIFTS[(ulong >> 52) & 0xf]
     mantissa >>= shift
 
     # clear the 1 bit to the left of the binary point
@@ -867,7 +997,109 @@ def ibm_to_ieee(ibm: bytes) -> float:
     # IEEE: 1-bit sign, 11-bits exponent, 52-bits mantissa
     # We didn't shift the sign bit, so it's already in the right spot
     ieee = sign | (exponent << 52) | mantissa
-    return struct.unpack(">d", struct.pack(">Q", ieee))[0]
+    return _UNPACK_D(_PACK_Q(ieee))[0]
+
+
+if numba is not None:
+
+    @numba.njit(cache=True)
+    def _ibm_to_ieee_bits(ulong):
+        """
+        Convert IBM-format to IEEE-format bits, for a nonzero mantissa.
+        """
+        # See ``ibm_to_ieee`` for an explanation of each step.
+        sign = ulong & np.uint64(0x8000000000000000)
+        exponent = (ulong >> np.uint64(56)) & np.uint64(0x7f)
+        mantissa = ulong & np.uint64(0x00ffffffffffffff)
+        shift = _SHIFTS_ARRAY[(ulong >> np.uint64(52)) & np.uint64(0xf)]
+        mantissa >>= shift
+        mantissa &= np.uint64(0xffefffffffffffff)
+        exponent = (exponent << np.uint64(2)) + shift + np.uint64(763)
+        return sign | (exponent << np.uint64(52)) | mantissa
+
+    # Not ``parallel=True``.  Numba's fallback threading layer crashes
+    # if called from several threads, and a column is memory-bound.
+    @numba.njit(cache=True, nogil=True)
+    def _ibm_to_ieee_kernel(ulong):
+        """
+        Convert an array of IBM-format bits to IEEE-format bits.
+        """
+        ieee = np.empty_like(ulong)
+        for i in range(len(ulong)):
+            ieee[i] = _ibm_to_ieee_bits(ulong[i])
+        return ieee
+
+
+def ibm_to_ieee_array(ibm: np.ndarray) -> np.ndarray:
+    """
+    Convert a column of IBM-format floating point to IEEE 754 64-bit.
+
+    This is a vectorized ``ibm_to_ieee``.  The input is a 2-dimensional
+    array of bytes, one row per value, which is decoded to a 1-dimensional
+    array of floats.  All missing values, including special missing
+    values, are decoded as regular NaNs.
+    """
+    n, size = ibm.shape
+
+    # Parse each row as an unsigned long long.  Usually numbers are
+    # 8 bytes, so the rows can be reinterpreted in-place.  Otherwise,
+    # pad-out to 8 bytes first.
+    padded = ibm
+    if size != 8:
+        padded = np.zeros((n, 8), dtype=np.uint8)
+        padded[:, :size] = ibm
+    try:
+        ulong = padded.view('>u8')[:, 0]
+    except ValueError:
+        # Older versions of NumPy can't reinterpret a strided view.
+        ulong = np.ascontiguousarray(padded).view('>u8')[:, 0]
+    ulong = ulong.astype(np.uint64)
+
+    if numba is not None:
+        ieee = _ibm_to_ieee_kernel(ulong)
+    else:
+        # See ``ibm_to_ieee`` for an explanation of each step.
+        sign = ulong & np.uint64(0x8000000000000000)
+        exponent = (ulong >> np.uint64(56)) & np.uint64(0x7f)
+        mantissa = ulong & np.uint64(0x00ffffffffffffff)
+
+        shift = _SHIFTS_ARRAY[(ulong >> np.uint64(52)) & np.uint64(0xf)]
+        mantissa >>= shift
+        mantissa &= np.uint64(0xffefffffffffffff)
+
+        # Same as ``(exponent - 65) * 4 + shift + 1023``, but stays positive.
+        exponent = (exponent << np.uint64(2)) + shift + np.uint64(763)
+
+        ieee = sign | (exponent << np.uint64(52)) | mantissa
+    ieee = ieee.view(np.float64)
+
+    missing = (ulong & np.uint64(0x00ffffffffffffff)) == 0
+    if missing.any():
+        first = padded[missing, 0]
+        codes = np.frombuffer(b'\x00\x80._' + string.ascii_uppercase.encode('ascii'), np.uint8)
+        valid = np.isin(first, codes)
+        if not valid.all():
+            invalid = padded[missing][~valid][0].tobytes()
+            raise ValueError(f'Neither "true" zero nor NaN: {invalid!r}')
+        ieee[missing] = np.where(first == 0x00, 0.0, np.where(first == 0x80, -0.0, np.nan))
+    return ieee
+
+
+def latin1_decode_array(column: np.ndarray) -> np.ndarray:
+    """
+    Decode a column of ISO-8859-1 text, stripping trailing whitespace.
+
+    The input is a 2-dimensional array of bytes, one row per value,
+    which is decoded to a 1-dimensional array of strings.  Latin-1 maps
+    each byte to the code point of the same value, so decoding is just
+    widening each byte to a 4-byte UCS-4 character.  Like NumPy's
+    fixed-width strings, trailing null characters are discarded.
+    """
+    n, size = column.shape
+    if size == 0:
+        return np.full(n, '', dtype=object)
+    ucs4 = np.ascontiguousarray(column, dtype=np.uint32).view(f'U{size}').ravel()
+    return np.char.rstrip(ucs4).astype(object)
 
 
 def ieee_to_ibm(ieee):
@@ -897,8 +1129,8 @@ def ieee_to_ibm(ieee):
     if math.isinf(ieee):
         raise NotImplementedError('Cannot convert infinity')
 
-    bits = struct.pack('>d', ieee)
-    ulong, = struct.unpack('>Q', bits)
+    bits = _PACK_D(ieee)
+    ulong, = _UNPACK_Q(bits)
 
     sign = (ulong & (1 << 63)) >> 63  # 1-bit     sign
     exponent = ((ulong & (0x7ff << 52)) >> 52) - 1023  # 11-bits   exponent
@@ -940,7 +1172,51 @@ def ieee_to_ibm(ieee):
     exponent <<= 56
 
     # We lose some precision, but who said floats were perfect?
-    return struct.pack('>Q', sign | exponent | mantissa)
+    return _PACK_Q(sign | exponent | mantissa)
+
+
+@contextlib.contextmanager
+def _buffer(fp):
+    """
+    Get the remaining contents of a bytes-mode file as a buffer.
+
+    A regular file is memory-mapped, avoiding a copy of its contents.
+    Any other file-like object, such as ``io.BytesIO``, is read.
+    """
+    mm = None
+    # Compressed and archive members, like ``gzip.GzipFile``, may have a
+    # ``fileno`` for the underlying file, which has different contents.
+    if isinstance(getattr(fp, 'raw', fp), io.FileIO):
+        try:
+            fd = fp.fileno()
+            if stat.S_ISREG(os.fstat(fd).st_mode):
+                mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+        except (AttributeError, OSError, ValueError):
+            pass  # Not a regular file, or an empty one.
+    if mm is None:
+        try:
+            bytestring = fp.read()
+        except UnicodeDecodeError:
+            raise TypeError(f'Expected a BufferedReader in bytes-mode, got {type(fp).__name__}')
+        yield bytestring
+        return
+    # Parsing reads the file front to back, so ask the OS to start
+    # reading ahead right away.  Available on Linux and Python 3.8+.
+    for advice in ('MADV_SEQUENTIAL', 'MADV_WILLNEED'):
+        if hasattr(mmap, advice):
+            mm.madvise(getattr(mmap, advice))
+    view = memoryview(mm)[fp.tell():]
+    fp.seek(0, io.SEEK_END)
+    try:
+        yield view
+    finally:
+        try:
+            view.release()
+            mm.close()
+        except BufferError:
+            # Something still references the mapping.  It will be
+            # closed when garbage collected.
+            LOG.debug('Memory-mapped file still in use')
 
 
 def load(fp):
@@ -950,11 +1226,8 @@ def load(fp):
         >>> with open('test/data/example.xpt', 'rb') as f:
         ...     library = load(f)
     """
-    try:
-        bytestring = fp.read()
-    except UnicodeDecodeError:
-        raise TypeError(f'Expected a BufferedReader in bytes-mode, got {type(fp).__name__}')
-    return loads(bytestring)
+    with _buffer(fp) as bytestring:
+        return loads(bytestring)
 
 
 def loads(bytestring):
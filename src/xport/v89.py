@@ -19,7 +19,7 @@ from datetime import datetime
 
 # Xport Modules
 import xport.v56
-from xport.v56 import _encoding, strftime, text_encode
+from xport.v56 import _buffer, _encoding, strftime, text_encode
 
 __all__ = [
     'load',
@@ -71,6 +71,11 @@ class MemberHeader(xport.v56.MemberHeader):
         rb'HEADER RECORD\*{7}OBSV8   HEADER RECORD\!{7}0{30}  ', re.DOTALL
     )
 
+    # Each long label record begins with the variable number, name length,
+    # and label length.  In v9, also the format and informat lengths.
+    label_header = struct.Struct('>hhh')
+    label_header_v9 = struct.Struct('>hhhhh')
+
     @classmethod
     def from_bytes(cls, bytestring):
         """
@@ -86,14 +91,15 @@ class MemberHeader(xport.v56.MemberHeader):
         n = int((match['n_labels'] or '0').strip())
         data = match['labels']
         namestrs = {n.number: n for n in self.namestrs.values()}
+        label_header = cls.label_header_v9 if v9 else cls.label_header
         for _ in range(n):
-            number, name_length, label_length = struct.unpack('>hhh', data[:6])
-            i = (10 if v9 else 6) + name_length
+            number, name_length, label_length, *lengths = label_header.unpack_from(data)
+            i = label_header.size + name_length
             j = i + label_length
             namestrs[number].name = data[6:i].decode(xport.v56.TEXT_METADATA_ENCODING)
             namestrs[number].label = data[i:j].decode(xport.v56.TEXT_METADATA_ENCODING)
             if v9:
-                format_length, informat_length = struct.unpack('>hh', data[6:10])
+                format_length, informat_length = lengths
             data = data[j:]
             if v9:
                 i = format_length
@@ -101,7 +107,7 @@ class MemberHeader(xport.v56.MemberHeader):
                 namestrs[number].format = xport.Format.from_spec(data[:i].decode('ascii'))
                 namestrs[number].informat = xport.Informat.from_spec(data[i:j].decode('ascii'))
                 data = data[j:]
-        if data and set(data) != {ord(b' ')}:
+        if data and data.strip(b' '):
             raise ValueError(f'Expected only padding, got {data}')
         return self
 
@@ -201,7 +207,7 @@ class Namestr(xport.v56.Namestr):
     #   char rest[18]       /* remaining fields are irrelevant */
 
     fmts = {
-        140: '>hhhh8s40s8shhh2s8shhl32sh18s',
+        140: struct.Struct('>hhhh8s40s8shhh2s8shhl32sh18s'),
         # v5/6 had a 136-length option, but that is not supported in v8/9.
     }
 
@@ -212,7 +218,7 @@ class Namestr(xport.v56.Namestr):
         """
         v56 = super().from_bytes(bytestring)
         fmt = cls.fmts[len(bytestring)]
-        tokens = struct.unpack(fmt, bytestring)
+        tokens = fmt.unpack(bytestring)
         longname = tokens[-3].strip(b'\x00').decode(xport.v56.TEXT_METADATA_ENCODING
                                                     ).rstrip() or v56.name
         if v56.name not in longname:
@@ -255,8 +261,7 @@ class Namestr(xport.v56.Namestr):
         if self.position is None:
             raise ValueError('Variable position not assigned')
 
-        return struct.pack(
-            fmt,
+        return fmt.pack(
             self.vtype,
             0,  # "Hash" of name, always 0.
             self.length,
@@ -285,11 +290,8 @@ def load(fp):
         >>> with open('test/data/example.v8xpt', 'rb') as file:
         ...     library = load(file)
     """
-    try:
-        bytestring = fp.read()
-    except UnicodeDecodeError:
-        raise TypeError(f'Expected a BufferedReader in bytes-mode, got {type(fp).__name__}')
-    return loads(bytestring)
+    with _buffer(fp) as bytestring:
+        return loads(bytestring)
 
 
 def loads(bytestring):
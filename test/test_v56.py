@@ -3,11 +3,16 @@ Tests for XPT format from SAS versions 5 and 6.
 """
 
 # Standard Library
+import concurrent.futures
+import gzip
+import io
 import math
 import string
+import tarfile
 from datetime import datetime
 
 # Community Packages
+import numpy as np
 import pandas as pd
 import pytest
 
@@ -188,6 +193,39 @@ class TestObservations:
         for got, expected in zip(obs, dataset.itertuples(index=False)):
             assert got == expected
 
+    def test_padding(self):
+        """
+        Verify observations end before the trailing rows of blank padding.
+        """
+        rows = xport.v56.observation_rows(b'abcd  ef    ', 2).tolist()
+        assert rows == [[97, 98], [99, 100], [32, 32], [101, 102]]
+        assert len(xport.v56.observation_rows(b' ' * 80, 8)) == 0
+        n = 2**20 + 3  # More than one batch.
+        assert len(xport.v56.observation_rows(b'x' + b' ' * n, 1)) == 1
+
+    @pytest.mark.parametrize('native', [True, False])
+    def test_special_missing_values(self, native, monkeypatch):
+        """
+        Verify observations keep special missing values like ``NaN.A``.
+        """
+        if not native:
+            monkeypatch.setattr(xport.v56, '_native', None)
+        header = xport.v56.MemberHeader.from_dataset(xport.v56.Member({'x': [1.0]}))
+        values = [1.0, xport.NaN.A, float('nan'), xport.NaN._, xport.NaN.Z]
+        bytestring = b''.join(xport.v56.ieee_to_ibm(x) for x in values)
+        got = [x for x, in xport.v56.Observations.from_bytes(bytestring, header)]
+        assert got[0] == 1.0
+        assert got[1] is xport.NaN.A
+        assert math.isnan(got[2]) and not isinstance(got[2], xport.NaN)
+        assert got[3:] == [xport.NaN._, xport.NaN.Z]
+
+    def test_decode_columns(self, dataset, observations_bytestring):
+        header = xport.v56.MemberHeader.from_dataset(dataset)
+        columns = xport.v56.Observations.columns_from_bytes(observations_bytestring, header)
+        assert list(columns) == list(dataset)
+        for name, column in columns.items():
+            assert column.tolist() == dataset[name].tolist()
+
     def test_encode(self, dataset, observations_bytestring):
         obs = xport.v56.Observations.from_dataset(dataset)
         i = 0
@@ -258,6 +296,42 @@ class TestLibrary:
         assert xport.v56.Library.from_bytes(bytestring)
 
 
+class TestLoad:
+
+    def test_file(self, library, library_bytestring, tmp_path):
+        path = tmp_path / 'example.xpt'
+        path.write_bytes(b'skip' + library_bytestring)
+        with open(path, 'rb') as f:
+            f.read(4)
+            assert xport.v56.load(f) == library
+            assert f.read() == b''
+
+    def test_bytes_io(self, library, library_bytestring):
+        assert xport.v56.load(io.BytesIO(library_bytestring)) == library
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / 'empty.xpt'
+        path.write_bytes(b'')
+        with open(path, 'rb') as f, xport.v56._buffer(f) as bytestring:
+            assert bytes(bytestring) == b''
+
+    def test_gzip(self, library, library_bytestring, tmp_path):
+        path = tmp_path / 'example.xpt.gz'
+        with gzip.open(path, 'wb') as f:
+            f.write(library_bytestring)
+        with gzip.open(path, 'rb') as f:
+            assert xport.v56.load(f) == library
+
+    def test_tar_member(self, library, library_bytestring, tmp_path):
+        path = tmp_path / 'example.tar'
+        with tarfile.open(path, 'w') as tar:
+            info = tarfile.TarInfo('example.xpt')
+            info.size = len(library_bytestring)
+            tar.addfile(info, io.BytesIO(library_bytestring))
+        with tarfile.open(path) as tar:
+            assert xport.v56.load(tar.extractfile('example.xpt')) == library
+
+
 class TestIEEEtoIBM:
 
     def roundtrip(self, n):
@@ -313,6 +387,122 @@ class TestIEEEtoIBM:
             assert self.roundtrip(i) == i
 
 
+class TestIBMtoIEEEArray:
+
+    def decode(self, values, size=8):
+        ibm = b''.join(xport.v56.ieee_to_ibm(x)[:size] for x in values)
+        column = np.frombuffer(ibm, dtype=np.uint8).reshape(len(values), size)
+        return xport.v56.ibm_to_ieee_array(column)
+
+    def test_matches_scalar(self):
+        values = [0, -0.0, 1, -1, 0.1, 1e9 + 0.5, -1e-6, 98.6, 16**60]
+        expected = [xport.v56.ibm_to_ieee(xport.v56.ieee_to_ibm(x)) for x in values]
+        assert self.decode(values).tolist() == expected
+
+    def test_short_width(self):
+        values = [1, 2.5, -1216, 0]
+        expected = [xport.v56.ibm_to_ieee(xport.v56.ieee_to_ibm(x)[:4]) for x in values]
+        assert self.decode(values, size=4).tolist() == expected
+
+    def test_missing_values(self):
+        values = [float('nan')] + [getattr(xport.NaN, c) for c in '_' + string.ascii_uppercase]
+        assert np.isnan(self.decode(values)).all()
+
+    def test_invalid_zero(self):
+        column = np.frombuffer(b'?' + b'\x00' * 7, dtype=np.uint8).reshape(1, 8)
+        with pytest.raises(ValueError):
+            xport.v56.ibm_to_ieee_array(column)
+
+    def test_without_numba(self, monkeypatch):
+        """
+        Verify the pure NumPy fallback when Numba is not installed.
+        """
+        monkeypatch.setattr(xport.v56, 'numba', None)
+        self.test_matches_scalar()
+        self.test_short_width()
+        self.test_missing_values()
+
+    def test_threads(self):
+        """
+        Verify decoding columns from several threads at once.
+        """
+        values = np.linspace(-1e6, 1e6, 10000)
+        bytestring = b''.join(xport.v56.ieee_to_ibm(x) for x in values)
+        column = np.frombuffer(bytestring, dtype=np.uint8).reshape(-1, 8)
+        with concurrent.futures.ThreadPoolExecutor(8) as pool:
+            results = list(pool.map(xport.v56.ibm_to_ieee_array, [column] * 32))
+        for got in results:
+            assert np.allclose(got, values)
+
+
+class TestLatin1DecodeArray:
+
+    def test_matches_scalar(self):
+        values = [b'ALIVE   ', b'\xe9t\xe9     ', b'\xa0\x1c \t    ', b'  x     ', b' ' * 8]
+        column = np.frombuffer(b''.join(values), dtype=np.uint8).reshape(len(values), 8)
+        expected = [s.decode('ISO-8859-1').rstrip() for s in values]
+        assert xport.v56.latin1_decode_array(column).tolist() == expected
+
+    def test_null_bytes(self, dataset, observations_bytestring):
+        """
+        Verify values with null bytes are decoded one at a time.
+        """
+        header = xport.v56.MemberHeader.from_dataset(dataset)
+        bytestring = observations_bytestring.replace(b'POOR    ', b'P\x00OR    ')
+        columns = xport.v56.Observations.columns_from_bytes(bytestring, header)
+        assert columns['ECON'].tolist() == ['P\x00OR', 'NOT', 'UNK'] * 2
+        assert columns['VIT_STAT'].tolist() == dataset['VIT_STAT'].tolist()
+
+
+class TestNative:
+    """
+    Verify the optional C extension matches the pure Python decoders.
+    """
+
+    @pytest.fixture(autouse=True)
+    def native(self):
+        return pytest.importorskip('xport._native')
+
+    def decode(self, bytestring, header):
+        layout, stride = xport.v56.variable_layout(header)
+        n = len(xport.v56.observation_rows(bytestring, stride))
+        return xport.v56._native.decode_rows(bytestring, stride, n, layout)
+
+    def test_decode(self, dataset, observations_bytestring):
+        header = xport.v56.MemberHeader.from_dataset(dataset)
+        rows = self.decode(observations_bytestring, header)
+        assert rows == list(dataset.itertuples(index=False, name=None))
+
+    def test_null_bytes(self, dataset, observations_bytestring):
+        header = xport.v56.MemberHeader.from_dataset(dataset)
+        bytestring = observations_bytestring.replace(b'POOR    ', b'P\x00OR    ')
+        rows = self.decode(bytestring, header)
+        assert [row[1] for row in rows] == ['P\x00OR', 'NOT', 'UNK'] * 2
+
+    def test_numbers(self):
+        values = [0, -0.0, 1, -1, 0.1, 1e9 + 0.5, -1e-6, 98.6, 16**60, float('nan'), xport.NaN.A]
+        bytestring = b''.join(xport.v56.ieee_to_ibm(x) for x in values)
+        rows = xport.v56._native.decode_rows(bytestring, 8, len(values), [(0, 8, True)])
+        got = [x for x, in rows]
+        expected = [xport.v56.ibm_to_ieee(xport.v56.ieee_to_ibm(x)) for x in values]
+        assert got[:-2] == expected[:-2]
+        assert all(math.isnan(x) for x in got[-2:])
+
+    def test_invalid_zero(self):
+        with pytest.raises(ValueError):
+            xport.v56._native.decode_rows(b'?' + b'\x00' * 7, 8, 1, [(0, 8, True)])
+        bytestring = b'ab' + b'\x00' * 8 + b'cd' + b'\x00' * 2 + b'?' + b'\x00' * 5
+        layout = [(0, 2, False), (2, 4, True), (4, 10, True)]
+        with pytest.raises(ValueError, match=r"\?"):
+            xport.v56._native.decode_rows(bytestring, 10, 2, layout)
+
+    def test_buffer_too_small(self):
+        with pytest.raises(ValueError):
+            xport.v56._native.decode_rows(b'\x00' * 8, 8, 2, [(0, 8, True)])
+        with pytest.raises(ValueError):
+            xport.v56._native.decode_rows(b'\x00' * 8, 8, 1, [(4, 12, True)])
+
+
 class TestEncode:
     """
     Verify various XPORT-encode features.
@@ -330,3 +330,20 @@ class TestLegacy:
         with pytest.warns(DeprecationWarning):
             result = xport.to_dataframe(fp)
         assert (result == ds).all(axis=None)
+
+    def test_dict_reader(self, library, library_bytestring):
+        ds = next(iter(library.values()))
+        fp = BytesIO(library_bytestring)
+        with pytest.warns(DeprecationWarning):
+            reader = xport.DictReader(fp)
+        assert list(reader) == ds.to_dict('records')
+
+    def test_reader(self, library, library_bytestring):
+        ds = next(iter(library.values()))
+        fp = BytesIO(library_bytestring)
+        with pytest.warns(DeprecationWarning):
+            reader = xport.Reader(fp)
+        rows = list(reader)
+        assert rows == list(ds.itertuples(index=False, name=None))
+        assert rows[0]._fields == tuple(ds.columns)
+        assert list(reader) == rows